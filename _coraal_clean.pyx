@@ -0,0 +1,128 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled cleaner for CORAAL transcript lines, used by push_to_huggingface.py when available.
+
+Build in place with:
+    pip install cython
+    CFLAGS="-O3" cythonize -i _coraal_clean.pyx
+
+clean_line() gives the same result as _clean_line() in push_to_huggingface.py,
+but replaces its regex with a single left-to-right scan over the raw bytes of the line.
+"""
+
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcmp
+
+
+cdef inline bint _is_space(unsigned char c) noexcept nogil:
+    # ASCII whitespace, as in bytes.split()
+    return c == c' ' or (c'\t' <= c <= c'\r')
+
+
+cdef inline bint _is_alpha(unsigned char c) noexcept nogil:
+    return (c'a' <= c <= c'z') or (c'A' <= c <= c'Z')
+
+
+cdef inline bint _is_bracket(unsigned char c) noexcept nogil:
+    return c == c'[' or c == c']'
+
+
+cpdef bytes clean_line(bytes line):
+    """
+    Clean one line of a CORAAL .txt file.
+    Returns the cleaned content column (whitespace normalized), or b'' if the
+    line has no content column, is a pause, or is empty once cleaned.
+    """
+    cdef const unsigned char *src = <const unsigned char *> (<const char *> line)
+    cdef Py_ssize_t start = 0, end = len(line)
+    cdef Py_ssize_t i, j, tabs = 0, out_len = 0
+    cdef bint pending_space = False, has_alpha
+    cdef unsigned char c
+    cdef char *out
+
+    # line.strip()
+    while start < end and _is_space(src[start]):
+        start += 1
+    while end > start and _is_space(src[end - 1]):
+        end -= 1
+
+    # Content column: between the 3rd and 4th tabs
+    i = start
+    while i < end and tabs < 3:
+        if src[i] == c'\t':
+            tabs += 1
+        i += 1
+    if tabs < 3:
+        return b''
+    start = i
+    while i < end and src[i] != c'\t':
+        i += 1
+    end = i
+
+    # Skip empty content and pause lines
+    if start == end:
+        return b''
+    if end - start >= 6 and memcmp(src + start, b"(pause", 6) == 0:
+        return b''
+
+    # Cleaning never makes the content longer
+    out = <char *> malloc(end - start)
+    if out == NULL:
+        raise MemoryError()
+
+    try:
+        i = start
+        while i < end:
+            c = src[i]
+
+            if c == c'<':
+                # Sound labels: <[^>]+>
+                j = i + 1
+                while j < end and src[j] != c'>':
+                    j += 1
+                if j < end and j > i + 1:
+                    i = j + 1
+                    continue
+
+            elif c == c'/':
+                # Redactions: /RD-[^/]+/
+                if end - i > 4 and memcmp(src + i + 1, b"RD-", 3) == 0:
+                    j = i + 4
+                    while j < end and src[j] != c'/':
+                        j += 1
+                    if j < end and j > i + 4:
+                        i = j + 1
+                        continue
+
+            elif c == c'(':
+                # Descriptors: letters (and brackets) in parentheses
+                j = i + 1
+                has_alpha = False
+                while j < end and (_is_alpha(src[j]) or _is_bracket(src[j])):
+                    has_alpha = has_alpha or _is_alpha(src[j])
+                    j += 1
+                if has_alpha and j < end and src[j] == c')':
+                    i = j + 1
+                    continue
+
+            elif _is_bracket(c):
+                # Brackets are removed, the text inside is kept
+                i += 1
+                continue
+
+            # Copy the character, collapsing runs of whitespace to a single space
+            if _is_space(c):
+                pending_space = out_len > 0
+            else:
+                if pending_space:
+                    out[out_len] = c' '
+                    out_len += 1
+                    pending_space = False
+                out[out_len] = <char> c
+                out_len += 1
+            i += 1
+
+        return PyBytes_FromStringAndSize(out, out_len)
+    finally:
+        free(out)
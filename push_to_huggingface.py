@@ -31,65 +31,104 @@ Setup:
 import os
 import re
 import csv
+import itertools
+import tempfile
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datasets import Dataset, DatasetDict, Audio, Features, Value
+
+# Use hf_xet's high-performance upload mode (must be set before huggingface_hub is imported)
+os.environ.setdefault('HF_XET_HIGH_PERFORMANCE', '1')
+
+# NOTE: datasets, huggingface_hub and pyarrow are imported inside the functions that use them,
+# so the worker processes extracting transcripts don't pay their import cost. Collecting samples
+# still imports pyarrow in the main process, to read the metadata files (see load_metadata)
+
+# Transcript cleaning pattern, applied in a single pass per line:
+#   <[^>]+>        sound labels (like <laugh>, <ts>)
+#   /RD-[^/]+/     redactions (like /RD-NAME-2/)
+#   \(...\)        descriptors in parentheses (like (breathy) or ([breathy]));
+#                  brackets are tolerated inside since they are stripped anyway
+#   [\[\]]         brackets (the text inside is kept)
+_RE_CLEAN = re.compile(rb'<[^>]+>|/RD-[^/]+/|\([\[\]]*[a-zA-Z][a-zA-Z\[\]]*\)|[\[\]]')
+
+# Maximum size and number of samples of an exported parquet shard
+MAX_SHARD_SIZE = 500 * 1024 * 1024
+MAX_SHARD_SAMPLES = 200
+
+# Default number of shards exported at once: each one is held in memory with its
+# audio embedded (up to MAX_SHARD_SIZE) until it is written
+EXPORT_WORKERS = 2
+
+# Folder inside the export folder that the parquet export is written to
+EXPORT_SUBFOLDER = 'coraal_parquet'
+
+
+def _clean_line(line):
+    """
+    Clean one raw (bytes) line of a CORAAL .txt file.
+    Returns the cleaned content column, or b'' for pauses and empty content.
+    """
+    parts = line.strip().split(b'\t', 4)
+    if len(parts) < 4:
+        return b''
+    
+    content = parts[3]  # Content column
+    
+    # Skip pause lines and empty content
+    if not content or content.startswith(b'(pause'):
+        return b''
+    
+    # Remove sound labels, redactions, descriptors and brackets
+    content = _RE_CLEAN.sub(b'', content)
+    
+    # Clean up whitespace
+    return b' '.join(content.split())
+
+
+# Compiled equivalent of _clean_line (see _coraal_clean.pyx), used when it has been built
+try:
+    from _coraal_clean import clean_line
+except ImportError:
+    clean_line = _clean_line
 
 
 def extract_text_from_txt(txt_path):
     """
     Extract and concatenate all transcript text from a CORAAL .txt file.
     Excludes pauses and metadata, returns a single concatenated string.
+    The file is read as bytes and only the kept content is decoded.
     """
     texts = []
     
     try:
-        with open(txt_path, 'r', encoding='utf-8') as f:
+        with open(txt_path, 'rb') as f:
             # Skip header line
             next(f)
             
             for line in f:
-                parts = line.strip().split('\t')
-                if len(parts) >= 4:
-                    content = parts[3]  # Content column
-                    
-                    # Skip pause lines
-                    if content.startswith('(pause'):
-                        continue
-                    
-                    # Skip empty content
-                    if not content or content == '':
-                        continue
-                    
-                    # Remove brackets but keep the text inside
-                    content = re.sub(r'[\[\]]', '', content)
-                    
-                    # Remove angle brackets and their content (like <laugh>, <ts>)
-                    content = re.sub(r'<[^>]+>', '', content)
-                    
-                    # Remove redactions entirely (like /RD-NAME-2/)
-                    content = re.sub(r'/RD-[^/]+/', '', content)
-                    
-                    # Remove descriptors in parentheses (like (breathy))
-                    content = re.sub(r'\([a-zA-Z]+\)', '', content)
-                    
-                    # Clean up whitespace
-                    content = ' '.join(content.split())
-                    
-                    if content:
-                        texts.append(content)
+                content = clean_line(line)
+                if content:
+                    texts.append(content)
+        
+        # Also collapse non-ASCII whitespace, which the bytes cleaning leaves as is
+        return ' '.join(b' '.join(texts).decode('utf-8').split())
     
     except Exception as e:
         print(f"Error reading {txt_path}: {e}")
         return ""
-    
-    return ' '.join(texts)
 
 
 def load_metadata(component_dir, component):
     """
     Load metadata from the component's metadata file.
-    Returns a dictionary mapping CORAAL.File to metadata row.
+    Returns a tuple (metadata_dict, header): a dictionary mapping CORAAL.File
+    to its metadata row (a tuple of values, in the order of the header) and
+    the list of column names.
     """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    
     # Find metadata file (pattern: COMPONENT_metadata_*.txt)
     metadata_files = list(Path(component_dir).glob(f'{component}_metadata_*.txt'))
     
@@ -98,31 +137,60 @@ def load_metadata(component_dir, component):
         print(f"  Searched in: {component_dir}")
         print(f"  Looking for pattern: {component}_metadata_*.txt")
         print(f"  Files in directory: {[f.name for f in Path(component_dir).glob('*.txt')][:5]}")
-        return {}
+        return {}, []
     
     metadata_file = metadata_files[0]
     print(f"  Found metadata: {metadata_file.name}")
     metadata_dict = {}
     
+    # pyarrow can't parse rows with the wrong number of fields, so they are
+    # collected here and added afterwards, padded with None like csv.DictReader did
+    ragged_rows = []
+    
+    def collect_ragged_row(row):
+        ragged_rows.append(row.text)
+        return 'skip'
+    
     try:
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
-            for row in reader:
-                file_id = row.get('CORAAL.File', '')
-                if file_id:
-                    metadata_dict[file_id] = row
+        # Read the header first so that every column is parsed as a string
+        with open(metadata_file, 'r', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f, delimiter='\t'), [])
+        
+        table = pacsv.read_csv(
+            metadata_file,
+            parse_options=pacsv.ParseOptions(delimiter='\t', invalid_row_handler=collect_ragged_row),
+            convert_options=pacsv.ConvertOptions(column_types={name: pa.string() for name in header}),
+        )
+        header = table.column_names
+        
+        if 'CORAAL.File' in header:
+            fid_idx = header.index('CORAAL.File')
+            rows = zip(*(column.to_pylist() for column in table.columns))
+            metadata_dict = {row[fid_idx]: row for row in rows if row[fid_idx]}
+            
+            # Pad (or trim) ragged rows to the header length
+            num_columns = len(header)
+            for row in csv.reader(ragged_rows, delimiter='\t'):
+                row = tuple(row[:num_columns]) + (None,) * (num_columns - len(row))
+                if row[fid_idx]:
+                    metadata_dict[row[fid_idx]] = row
+        
+        if ragged_rows:
+            print(f"  WARNING: {len(ragged_rows)} rows in {metadata_file.name} "
+                  f"don't have {len(header)} fields; missing values are set to None")
         
         if not metadata_dict:
             print(f"  ERROR: No valid metadata entries found in {metadata_file.name}")
             print(f"  Check that the file has a 'CORAAL.File' column")
-        else:
-            print(f"  Loaded {len(metadata_dict)} metadata entries")
-            
+            return {}, []
+        
+        print(f"  Loaded {len(metadata_dict)} metadata entries")
+        
     except Exception as e:
         print(f"  ERROR reading metadata file {metadata_file}: {e}")
-        return {}
+        return {}, []
     
-    return metadata_dict
+    return metadata_dict, header
 
 
 def parse_filename(filename):
@@ -131,97 +199,132 @@ def parse_filename(filename):
     Format: COMPONENT_seX_agY_GENDER_ID_SESSION.ext
     Example: ATL_se0_ag1_f_01_1.wav -> ATL_se0_ag1_f_01
     """
-    base = Path(filename).stem
+    # Plain string operations instead of Path(filename).stem
+    name = filename.rsplit(os.sep, 1)[-1]
+    base = name.rsplit('.', 1)[0] if '.' in name[1:] else name
     # Extract the file_id without the session number at the end
     # e.g., ATL_se0_ag1_f_01_1 -> ATL_se0_ag1_f_01
-    parts = base.rsplit('_', 1)
-    if len(parts) == 2:
-        file_id = parts[0]
-    else:
-        file_id = base
-    
-    return file_id
+    i = base.rfind('_')
+    return base[:i] if i != -1 else base
 
 
-def collect_dataset_samples(base_dir='.', max_per_component=None):
+def collect_dataset_samples(base_dir='.', max_per_component=None, num_workers=None):
     """
     Collect all audio files and their corresponding transcripts.
-    Returns a dictionary mapping component names to lists of samples.
+    Returns a dictionary mapping component names to their samples, stored
+    column-wise as a dictionary mapping column names to lists of values.
     
     Args:
         base_dir: Base directory containing component folders
         max_per_component: Maximum samples per component (None = all samples)
+        num_workers: Number of worker processes for transcript extraction
+            (None = one less than the number of CPUs)
     """
     components = ['ATL', 'DCA', 'DCB', 'DTA', 'LES', 'PRV', 'ROC', 'VLD']
     
     all_samples = {}
     
-    for component in components:
-        component_dir = os.path.join(base_dir, component)
-        
-        if not os.path.isdir(component_dir):
-            print(f"Warning: {component} directory not found, skipping...")
-            continue
-        
-        # Load metadata for this component
-        metadata_dict = load_metadata(component_dir, component)        
-        if not metadata_dict:
-            print(f"  WARNING: No metadata loaded for {component}, samples will have no metadata columns")
-        
-        # Find all audio files
-        wav_files = list(Path(component_dir).glob('*.wav'))
-        
-        # Limit samples if in test mode
-        if max_per_component is not None:
-            wav_files = wav_files[:max_per_component]
-        
-        total_in_dir = len(list(Path(component_dir).glob('*.wav')))
-        if max_per_component is not None and total_in_dir > max_per_component:
-            print(f"Processing {component}: {len(wav_files)} audio files (limited from {total_in_dir})")
-        else:
-            print(f"Processing {component}: {len(wav_files)} audio files")
-        
-        samples = []
-        
-        for wav_file in wav_files:
-            # Get corresponding txt file
-            txt_file = wav_file.with_suffix('.txt')
+    if num_workers is None:
+        num_workers = max(1, (os.cpu_count() or 1) - 1)
+    
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for component in components:
+            component_dir = os.path.join(base_dir, component)
             
-            if not txt_file.exists():
-                print(f"Warning: No transcript found for {wav_file.name}")
+            if not os.path.isdir(component_dir):
+                print(f"Warning: {component} directory not found, skipping...")
                 continue
             
-            # Extract text
-            text = extract_text_from_txt(txt_file)
+            # Load metadata for this component
+            metadata_dict, metadata_header = load_metadata(component_dir, component)
+            if not metadata_dict:
+                print(f"  WARNING: No metadata loaded for {component}, samples will have no metadata columns")
+            
+            # Find all audio files and transcripts, indexed by stem, in a single directory scan
+            wavs = {}
+            txts = {}
+            with os.scandir(component_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext == '.wav':
+                        wavs[stem] = entry.path
+                    elif ext == '.txt':
+                        txts[stem] = entry.path
+            
+            wav_files = list(wavs.items())
+            
+            # Limit samples if in test mode
+            if max_per_component is not None:
+                wav_files = wav_files[:max_per_component]
             
-            # Parse filename to get file_id (use full stem for metadata lookup)
-            full_file_id = Path(wav_file).stem
+            total_in_dir = len(wavs)
+            if max_per_component is not None and total_in_dir > max_per_component:
+                print(f"Processing {component}: {len(wav_files)} audio files (limited from {total_in_dir})")
+            else:
+                print(f"Processing {component}: {len(wav_files)} audio files")
             
-            # Get metadata for this file using the full file_id
-            file_metadata = metadata_dict.get(full_file_id, {})
+            pairs = []
             
-            if not file_metadata and metadata_dict:
-                # Debug: show what we're looking for vs what's available
-                print(f"  Warning: No metadata found for {full_file_id}")
-                sample_keys = list(metadata_dict.keys())[:3]
-                print(f"    Sample metadata keys: {sample_keys}")
+            for stem, wav_file in wav_files:
+                # Get corresponding txt file
+                txt_file = txts.get(stem)
+                
+                if txt_file is None:
+                    print(f"Warning: No transcript found for {stem}.wav")
+                    continue
+                
+                pairs.append((stem, wav_file, txt_file))
             
-            # Create sample with text, file_id, and all metadata columns
-            sample = {
-                'audio': str(wav_file),
-                'text': text,
-                'file_id': full_file_id,
-            }
+            # Extract text from all transcripts in parallel
+            txt_files = [txt_file for _, _, txt_file in pairs]
+            chunksize = max(1, len(txt_files) // (4 * num_workers))
+            texts = executor.map(extract_text_from_txt, txt_files, chunksize=chunksize)
             
-            # Add all metadata columns
-            if file_metadata:
-                sample.update(file_metadata)
+            # Build the samples column-wise: text, file_id and all metadata columns
+            columns = {'audio': [], 'text': [], 'file_id': []}
             
-            samples.append(sample)
+            # Metadata columns for this component, with their index in the metadata rows
+            metadata_columns = []
+            for index, key in enumerate(metadata_header):
+                if key not in columns:
+                    columns[key] = []
+                    metadata_columns.append((index, columns[key]))
+            
+            # Shared row of None values used for files without metadata
+            missing_row = (None,) * len(metadata_header)
+            
+            missing_metadata = 0
+            
+            for (stem, wav_file, _), text in zip(pairs, texts):
+                # Use the full stem (from the directory scan) as file_id for metadata lookup
+                full_file_id = stem
+                
+                # Get metadata for this file using the full file_id
+                file_metadata = metadata_dict.get(full_file_id, missing_row)
+                
+                if file_metadata is missing_row and metadata_dict:
+                    # Debug: show what we're looking for vs what's available (first miss only)
+                    if not missing_metadata:
+                        print(f"  Warning: No metadata found for {full_file_id}")
+                        sample_keys = list(itertools.islice(metadata_dict, 3))
+                        print(f"    Sample metadata keys: {sample_keys}")
+                    missing_metadata += 1
+                
+                columns['audio'].append(wav_file)
+                columns['text'].append(text)
+                columns['file_id'].append(full_file_id)
+                
+                for index, values in metadata_columns:
+                    values.append(file_metadata[index])
+            
+            if missing_metadata > 1:
+                print(f"  Warning: No metadata found for {missing_metadata} files in {component}")
+            
+            if columns['file_id']:
+                all_samples[component] = columns
         
-        if samples:
-            all_samples[component] = samples
-    
     return all_samples
 
 
@@ -231,31 +334,29 @@ def create_datasets(all_samples):
     Returns a dictionary mapping component names to their datasets.
     Each component will be a separate config/subset with its own metadata schema.
     """
+    from datasets import Dataset, Audio, Features, Value
+    
     component_datasets = {}
     
-    for component, samples in all_samples.items():
-        if not samples:
+    # Features shared by all components
+    base_features = {
+        'audio': Audio(sampling_rate=None),
+        'text': Value('string'),
+        'file_id': Value('string'),
+    }
+    
+    for component, columns in all_samples.items():
+        if not columns['file_id']:
             continue
         
-        # Get all unique column names from samples for this component
-        all_keys = set()
-        for sample in samples:
-            all_keys.update(sample.keys())
-        
-        # Define features dynamically based on what's in this component's data
-        features = {
-            'audio': Audio(sampling_rate=None),
-            'text': Value('string'),
-            'file_id': Value('string'),
-        }
-        
-        # Add all other columns as string features
-        for key in all_keys:
+        # The remaining columns are this component's metadata header, all stored as strings
+        features = dict(base_features)
+        for key in columns:
             if key not in features:
                 features[key] = Value('string')
         
         # Create dataset for this component
-        dataset = Dataset.from_list(samples, features=Features(features))
+        dataset = Dataset.from_dict(columns, features=Features(features))
         
         component_datasets[component] = dataset
         
@@ -264,35 +365,163 @@ def create_datasets(all_samples):
     return component_datasets
 
 
-def push_dataset_to_hub(component_datasets, repo_id, token=None, private=False):
+def _num_shards(dataset, max_shard_size=MAX_SHARD_SIZE, max_shard_samples=MAX_SHARD_SAMPLES):
+    """
+    Number of parquet shards needed to keep each shard under max_shard_size
+    (estimated from the size of the dataset's audio files) and max_shard_samples.
+    """
+    from datasets import Audio
+    
+    audio = dataset.cast_column('audio', Audio(decode=False))['audio']
+    nbytes = sum(os.path.getsize(a['path']) for a in audio)
+    num_shards = max(-(-nbytes // max_shard_size), -(-len(dataset) // max_shard_samples))
+    return max(1, min(len(dataset), num_shards))
+
+
+def _export_shard(dataset, index, num_shards, path):
+    """
+    Write one shard of a dataset to a parquet file, embedding the audio bytes.
+    """
+    from datasets.table import embed_table_storage
+    
+    shard = dataset.shard(num_shards=num_shards, index=index, contiguous=True)
+    shard = shard.with_format('arrow').map(embed_table_storage, batched=True, keep_in_memory=True)
+    shard.to_parquet(path)
+
+
+def export_parquet_shards(component_datasets, folder, num_workers=None):
+    """
+    Export each component to parquet shards in the layout used by push_to_hub:
+    folder/COMPONENT/test-XXXXX-of-YYYYY.parquet
+    
+    Args:
+        component_datasets: Dictionary mapping component names to Dataset objects
+        folder: Output folder
+        num_workers: Number of threads writing shards, i.e. of shards held in memory
+            at once (None = EXPORT_WORKERS, capped by the number of CPUs)
+    """
+    if num_workers is None:
+        num_workers = min(EXPORT_WORKERS, os.cpu_count() or 1)
+    
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # Submit the shards of all components up front, so that the workers
+        # never wait for one component to finish before starting the next.
+        # A shard is only built once a worker picks it up, so at most
+        # num_workers shards are in memory.
+        futures = {}
+        num_shards = {}
+        remaining = {}
+        for component, dataset in component_datasets.items():
+            num_shards[component] = remaining[component] = _num_shards(dataset)
+            # Remove shards left by an earlier export, which may have had a different shard count
+            os.makedirs(os.path.join(folder, component), exist_ok=True)
+            for path in Path(folder, component).glob('test-*.parquet'):
+                path.unlink()
+            
+            for index in range(num_shards[component]):
+                path = os.path.join(folder, component, f'test-{index:05d}-of-{num_shards[component]:05d}.parquet')
+                future = executor.submit(_export_shard, dataset, index, num_shards[component], path)
+                futures[future] = component
+        
+        for future in as_completed(futures):
+            future.result()
+            component = futures[future]
+            remaining[component] -= 1
+            if not remaining[component]:
+                print(f"    ✓ Config '{component}' exported "
+                      f"({len(component_datasets[component])} samples, {num_shards[component]} shards)")
+
+
+def _write_dataset_card(folder, components):
+    """
+    Write a README.md declaring one config per component, each with a 'test' split.
+    """
+    lines = ['---', 'configs:']
+    for component in components:
+        lines += [
+            f'- config_name: {component}',
+            '  data_files:',
+            '  - split: test',
+            f'    path: {component}/test-*',
+        ]
+    lines += ['---', '']
+    
+    with open(os.path.join(folder, 'README.md'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def _check_export_dir(export_dir, base_dir, components):
+    """
+    Raise a ValueError if export_dir is or contains base_dir or a component
+    source folder, or is inside a component source folder.
+    """
+    export_dir = os.path.realpath(export_dir)
+    base_dir = os.path.realpath(base_dir)
+    
+    if os.path.commonpath([export_dir, base_dir]) == export_dir:
+        raise ValueError(f"Export folder {export_dir} contains the corpus folder {base_dir}")
+    
+    for component in components:
+        component_dir = os.path.join(base_dir, component)
+        if os.path.commonpath([export_dir, component_dir]) in (export_dir, component_dir):
+            raise ValueError(f"Export folder {export_dir} overlaps the source folder {component_dir}")
+
+
+def push_dataset_to_hub(component_datasets, repo_id, token=None, private=False, export_dir=None,
+                        base_dir='.'):
     """
     Push the dataset to Hugging Face Hub.
     Each component is pushed as a separate config/subset with a 'test' split.
     
+    The components are first exported to parquet shards in the EXPORT_SUBFOLDER
+    folder of export_dir, which is then uploaded with HfApi.upload_folder. The
+    export holds all the audio, so export_dir needs about as much free space as
+    the audio files (~50GB for the full corpus).
+    
     Args:
         component_datasets: Dictionary mapping component names to Dataset objects
         repo_id: Repository ID on HuggingFace (e.g., "username/coraal")
         token: HuggingFace token (optional, will use HF_TOKEN env var if not provided)
         private: Whether to make the repository private
+        export_dir: Folder for the parquet export, kept after the upload
+            (None = a temporary folder, deleted after the upload). Must not
+            overlap base_dir or its component folders
+        base_dir: Base directory containing the component source folders
     """
+    from huggingface_hub import HfApi
+    
     print(f"\nPushing dataset to {repo_id}...")
     total_samples = sum(len(ds) for ds in component_datasets.values())
     print(f"Total samples: {total_samples} across {len(component_datasets)} configs")
     print(f"Private: {private}")
     print(f"Configs: {', '.join(component_datasets.keys())}")
     
-    for component, dataset in component_datasets.items():
-        print(f"\n  Pushing config '{component}'...")
-        # Wrap in DatasetDict with 'test' split
-        dataset_dict = DatasetDict({"test": dataset})
+    if export_dir is not None:
+        _check_export_dir(export_dir, base_dir, component_datasets.keys())
+    
+    with tempfile.TemporaryDirectory() if export_dir is None else nullcontext(export_dir) as export_root:
+        folder = os.path.join(export_root, EXPORT_SUBFOLDER)
+        os.makedirs(folder, exist_ok=True)
+        
+        print(f"\n  Exporting parquet shards to {folder}...")
+        export_parquet_shards(component_datasets, folder)
+        _write_dataset_card(folder, component_datasets.keys())
         
-        dataset_dict.push_to_hub(
-            repo_id,
-            config_name=component,
-            token=token,
-            private=private
+        print("\n  Uploading...")
+        api = HfApi(token=token)
+        api.create_repo(repo_id, repo_type='dataset', private=private, exist_ok=True)
+        api.upload_folder(
+            repo_id=repo_id,
+            folder_path=folder,
+            repo_type='dataset',
+            commit_message=f"Upload configs {', '.join(component_datasets.keys())}",
+            # Only upload the card and the shards of this export, not other files in
+            # the folder (e.g. configs left by an earlier run with more components)
+            allow_patterns=['README.md'] + [f'{component}/test-*.parquet' for component in component_datasets],
+            # Remove the shards of earlier pushes (e.g. a TEST_MODE run), which the
+            # test-* glob in the dataset card would otherwise load as well
+            delete_patterns=[f'{component}/test-*' for component in component_datasets]
         )
-        print(f"    ✓ Config '{component}' pushed ({len(dataset)} samples)")
     
     print(f"\n✓ All configs successfully pushed to https://huggingface.co/datasets/{repo_id}")
     print(f"  Load with: load_dataset('{repo_id}', 'COMPONENT_NAME')")
@@ -312,6 +541,7 @@ def main():
     TOKEN = None  # Will use HF_TOKEN environment variable if None
     TEST_MODE = False  # Set to False to upload full dataset
     TEST_SAMPLES_PER_COMPONENT = 2  # Number of samples per component in test mode
+    EXPORT_DIR = None  # Folder for the parquet export before upload, outside the corpus (None = temporary folder)
     
     print(f"\nConfiguration:")
     print(f"  Repository: {REPO_ID}")
@@ -319,6 +549,7 @@ def main():
     print(f"  Test Mode: {TEST_MODE}")
     if TEST_MODE:
         print(f"  Samples per component: {TEST_SAMPLES_PER_COMPONENT}")
+    print(f"  Export folder: {os.path.join(EXPORT_DIR, EXPORT_SUBFOLDER) if EXPORT_DIR else '(temporary)'}")
     print()
     
     # Collect samples
@@ -330,21 +561,20 @@ def main():
         print("Error: No samples collected. Check that audio and txt files exist.")
         return
     
-    total_count = sum(len(samples) for samples in all_samples.values())
+    total_count = sum(len(columns['file_id']) for columns in all_samples.values())
     print(f"✓ Collected {total_count} samples across {len(all_samples)} components\n")
     
     # Show sample data for each component
     print("Sample data for each component:")
     print("=" * 70)
-    for component, samples in all_samples.items():
-        if samples:
-            first_sample = samples[0]
+    for component, columns in all_samples.items():
+        if columns['file_id']:
             # Get metadata columns (exclude audio, text, file_id)
-            metadata_cols = [k for k in first_sample.keys() if k not in ['audio', 'text', 'file_id']]
+            metadata_cols = [k for k in columns if k not in ['audio', 'text', 'file_id']]
             
             print(f"\n{component}:")
-            print(f"  File ID: {first_sample['file_id']}")
-            print(f"  Text preview: {first_sample['text'][:500]}...")
+            print(f"  File ID: {columns['file_id'][0]}")
+            print(f"  Text preview: {columns['text'][0][:500]}...")
             print(f"  Metadata columns ({len(metadata_cols)}): {', '.join(metadata_cols[:10])}")
             if len(metadata_cols) > 10:
                 print(f"    ... and {len(metadata_cols) - 10} more")
@@ -370,7 +600,8 @@ def main():
         return
     
     try:
-        push_dataset_to_hub(component_datasets, REPO_ID, token=TOKEN, private=PRIVATE)
+        push_dataset_to_hub(component_datasets, REPO_ID, token=TOKEN, private=PRIVATE, export_dir=EXPORT_DIR,
+                            base_dir='.')
     except Exception as e:
         print(f"\n✗ Error pushing to hub: {e}")
         print("\nMake sure you:")
@@ -5,9 +5,15 @@ Verify CORAAL corpus statistics: word counts and duration in hours.
 
 import os
 import re
-from pathlib import Path
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from collections import defaultdict
 
+# Word-count cleaning pattern, replaced with a space in a single pass:
+# redaction markers (any word starting with RD-, like /RD-NAME-1/ once its
+# slashes are gone), then any bracket/markup character
+_RE_MARKUP = re.compile(r'(?<![^\s<\[\]/])RD-[^\s<\[\]/]*|[<\[\]/]')
+
 
 def count_words_from_txt(txt_path):
     """Count words from a CORAAL .txt file, excluding pauses and metadata."""
@@ -31,18 +37,12 @@ def count_words_from_txt(txt_path):
                     if not content or content == '':
                         continue
                     
-                    # Remove brackets and markup
-                    # [text], </text>, /text/, <text>, etc.
-                    content = re.sub(r'[<\[\]/]', ' ', content)
-                    
-                    # Remove redaction markers like /RD-NAME-1/
-                    content = re.sub(r'/RD-[A-Z]+-\d+/', '', content)
+                    # Remove redaction markers, brackets and markup
+                    # /RD-NAME-1/, [text], </text>, /text/, <text>, etc.
+                    content = _RE_MARKUP.sub(' ', content)
                     
                     # Split by whitespace and count
-                    words = content.split()
-                    # Filter out empty strings and special markers
-                    words = [w for w in words if w and not w.startswith('RD-')]
-                    word_count += len(words)
+                    word_count += len(content.split())
     
     except Exception as e:
         print(f"Error reading {txt_path}: {e}")
@@ -53,57 +53,77 @@ def count_words_from_txt(txt_path):
 def get_duration_from_textgrid(textgrid_path):
     """Extract the maximum time (duration) from a TextGrid file."""
     try:
-        with open(textgrid_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                # Look for xmax = value at the file level (not in intervals)
-                if line.strip().startswith('xmax ='):
-                    # Extract the number
-                    match = re.search(r'xmax\s*=\s*([\d.]+)', line)
-                    if match:
-                        return float(match.group(1))
+        with open(textgrid_path, 'rb') as f:
+            # Empty files cannot be memory-mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0.0
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # The first xmax is the file-level one (not in intervals) and is part
+                # of the header, so only the first few lines are usually read
+                for line in iter(mm.readline, b''):
+                    stripped = line.lstrip()
+                    if stripped.startswith(b'xmax ='):
+                        # e.g. "xmax = 1234.567"
+                        value = stripped.partition(b'=')[2].strip()
+                        if value:
+                            try:
+                                return float(value.split()[0])
+                            except ValueError:
+                                pass
         return 0.0
     except Exception as e:
         print(f"Error reading {textgrid_path}: {e}")
         return 0.0
 
 
-def analyze_corpus(base_dir='.'):
-    """Analyze all CORAAL components and calculate statistics."""
+def analyze_corpus(base_dir='.', num_workers=None):
+    """Analyze all CORAAL components and calculate statistics, using `num_workers` processes."""
     
     components = ['ATL', 'DCA', 'DCB', 'DTA', 'LES', 'PRV', 'ROC', 'VLD']
     
     results = {}
     
-    for component in components:
-        component_dir = os.path.join(base_dir, component)
-        
-        if not os.path.isdir(component_dir):
-            print(f"Warning: {component} directory not found")
-            continue
-        
-        total_words = 0
-        total_seconds = 0
-        
-        # Process all .txt files
-        txt_files = list(Path(component_dir).glob('*.txt'))
-        textgrid_files = list(Path(component_dir).glob('*.TextGrid'))
-        
-        for txt_file in txt_files:
-            words = count_words_from_txt(txt_file)
-            total_words += words
-        
-        for textgrid_file in textgrid_files:
-            duration = get_duration_from_textgrid(textgrid_file)
-            total_seconds += duration
-        
-        total_hours = total_seconds / 3600
-        
-        results[component] = {
-            'words': total_words,
-            'hours': total_hours,
-            'txt_files': len(txt_files),
-            'textgrid_files': len(textgrid_files)
-        }
+    if num_workers is None:
+        num_workers = max(1, (os.cpu_count() or 1) - 1)
+    
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for component in components:
+            component_dir = os.path.join(base_dir, component)
+            
+            if not os.path.isdir(component_dir):
+                print(f"Warning: {component} directory not found")
+                continue
+            
+            # Find all .txt and .TextGrid files in a single directory scan
+            txt_files = []
+            textgrid_files = []
+            with os.scandir(component_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    if entry.name.endswith('.txt'):
+                        txt_files.append(entry.path)
+                    elif entry.name.endswith('.TextGrid'):
+                        textgrid_files.append(entry.path)
+            
+            # Submit both file types before collecting so they run together
+            words = executor.map(count_words_from_txt, txt_files,
+                                 chunksize=max(1, len(txt_files) // (4 * num_workers)))
+            durations = executor.map(get_duration_from_textgrid, textgrid_files,
+                                     chunksize=max(1, len(textgrid_files) // (4 * num_workers)))
+            
+            total_words = sum(words)
+            total_seconds = sum(durations)
+            
+            total_hours = total_seconds / 3600
+            
+            results[component] = {
+                'words': total_words,
+                'hours': total_hours,
+                'txt_files': len(txt_files),
+                'textgrid_files': len(textgrid_files)
+            }
     
     return results
 